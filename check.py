@@ -1,29 +1,49 @@
+import re
+import sys
+
+import numpy as np
 import pandas as pd
 
 file_path = "Bill.csv"
 
-# Load CSV
-df = pd.read_csv(file_path)
-
 required_columns = ["S.n", "Work code", "Contract Bill No", "Work", "Item", "Cost"]
 
+# Text-only columns are read as categoricals without type inference (their
+# values repeat heavily); S.n, Contract Bill No and Cost are still inferred so
+# they print as before
+text_dtypes = {"Work code": "category", "Work": "category", "Item": "category"}
+
 print("Checking required columns...\n")
 
-# 1️⃣ Check missing columns
-missing_columns = [col for col in required_columns if col not in df.columns]
+# 1️⃣ Check missing columns (header only, before any rows are parsed)
+header = pd.read_csv(file_path, nrows=0).columns
+missing_columns = [col for col in required_columns if col not in header]
 
 if missing_columns:
     print("Missing required columns:", missing_columns)
     exit()
 
+# Load CSV, keeping only the columns the checks use
+# (Arrow's multithreaded reader when pyarrow is installed, otherwise the
+# C parser reading straight from a memory-mapped file)
+try:
+    df = pd.read_csv(file_path, engine="pyarrow", usecols=required_columns,
+                     dtype=text_dtypes)
+except ImportError:
+    df = pd.read_csv(file_path, usecols=required_columns, dtype=text_dtypes,
+                     memory_map=True)
+
 print("All required columns present.\n")
 
-# 2️⃣ Check empty required fields
+# String form of the required columns, shared by the checks below
+text_df = df[required_columns].astype(str)
+
+# 2️⃣ Check empty required fields (one missing-value matrix for all columns)
+missing_mask = df[required_columns].isna() | text_df.apply(lambda s: s.str.strip() == "")
 for col in required_columns:
-    missing_rows = df[df[col].isna() | (df[col].astype(str).str.strip() == "")]
-    if not missing_rows.empty:
+    if missing_mask[col].any():
         print(f"Rows with missing values in column '{col}':")
-        print(missing_rows[["S.n", col]])
+        print(df.loc[missing_mask[col], ["S.n", col]])
         print()
 
 # Convert Cost to numeric safely
@@ -33,46 +53,98 @@ print("Checking Coordination Charges...\n")
 
 tolerance = 10
 
-# Get unique bill numbers
-bill_numbers = df["Contract Bill No"].dropna().unique()
-
-for bill in bill_numbers:
-
-    bill_df = df[df["Contract Bill No"] == bill]
-
-    # Identify coordination charge row
-    coord_rows = bill_df[
-        (bill_df["Work"].str.contains("coordination", case=False, na=False)) |
-        (bill_df["Work code"].astype(str).str.startswith("C"))
-    ]
-
-    if coord_rows.empty:
-        print(f"⚠ No coordination charge found for Bill {bill}")
+# Classify each distinct Work text once (0 = base, 1 = coordination,
+# 2 = Supervisor/Miscellaneous) and map the result back onto the rows
+WORK_BASE, WORK_COORD, WORK_EXCLUDED = 0, 1, 2
+# Compiled once, case-insensitive, so the values need no lowercased copy
+EXCLUDED_WORK_RE = re.compile("coordination|supervisor|misc", re.IGNORECASE)
+COORD_WORK_RE = re.compile("coordination", re.IGNORECASE)
+
+work_codes, work_values = pd.factorize(df["Work"])
+work_values = pd.Series(work_values)
+# One alternation pass flags every excluded keyword; only the matching values
+# are searched again to tell coordination rows apart
+has_keyword = work_values.str.contains(EXCLUDED_WORK_RE).to_numpy(dtype=bool)
+is_coord_text = has_keyword.copy()
+is_coord_text[has_keyword] = work_values[has_keyword].str.contains(COORD_WORK_RE)
+work_categories = np.zeros(len(work_values) + 1, dtype=np.int8)  # last slot: empty Work
+work_categories[:-1][has_keyword] = WORK_EXCLUDED
+work_categories[:-1][is_coord_text] = WORK_COORD
+work_category = pd.Series(work_categories[work_codes], index=df.index)
+
+# Work code is read as a categorical, so the "C" prefix test runs once per
+# distinct code
+work_code = df["Work code"]
+code_is_c = np.append(work_code.cat.categories.astype(str).str.startswith("C"), False)  # last slot: empty code
+
+# Coordination charge rows
+is_coord = (work_category == WORK_COORD) | code_is_c[work_code.cat.codes]
+
+# Exclude Supervisor, Miscellaneous, Coordination rows
+is_base = (work_category == WORK_BASE) & ~is_coord
+
+# Per-bill accumulators over dense bill codes. factorize numbers the bills in
+# order of first appearance, so its uniques are the report order and no
+# separate unique() pass is needed. Rows without a bill number are dropped; a
+# missing Cost contributes nothing, as with sum().
+bill_codes, bill_numbers = pd.factorize(df["Contract Bill No"])
+has_bill = bill_codes >= 0
+bill_codes = bill_codes[has_bill]
+n_bills = len(bill_numbers)
+cost = df["Cost"].to_numpy(dtype=np.float64, na_value=0.0)[has_bill]
+
+# Fold each row's role into the bill key (bill * 3 + role). A stable sort on
+# the key lays every (bill, role) group out contiguously in file order, so each
+# total is one sum() over its slice: the same pairwise summation, over the same
+# values in the same order, as summing each bill's rows did. A weighted
+# bincount adds naively and can differ in the last bits, which at the
+# tolerance edge would move a bill between pass and fail.
+ROLE_BASE, ROLE_COORD, ROLE_EXCLUDED = 0, 1, 2
+role = np.full(len(bill_codes), ROLE_EXCLUDED, dtype=np.intp)
+role[is_base.to_numpy()[has_bill]] = ROLE_BASE
+role[is_coord.to_numpy()[has_bill]] = ROLE_COORD
+key = bill_codes.astype(np.intp) * 3 + role
+order = np.argsort(key, kind="stable")
+sorted_cost = cost[order]
+bounds = np.searchsorted(key[order], np.arange(3 * n_bills + 1))
+counts = np.diff(bounds).reshape(n_bills, 3)
+sums = np.zeros((n_bills, 3))
+for group_role in (ROLE_BASE, ROLE_COORD):
+    starts = bounds[group_role:-1:3]
+    stops = bounds[group_role + 1::3]
+    sums[:, group_role] = [sorted_cost[start:stop].sum()
+                           for start, stop in zip(starts, stops)]
+
+summary = pd.DataFrame({
+    "has_coord": counts[:, ROLE_COORD] > 0,
+    "actual": sums[:, ROLE_COORD],
+    "base": sums[:, ROLE_BASE],
+}, index=bill_numbers)
+summary["expected"] = summary["base"] * 0.15
+summary["difference"] = (summary["expected"] - summary["actual"]).abs()
+summary["within_tolerance"] = summary["difference"] <= tolerance
+
+# Collect the report and write it once instead of one print per line
+report = []
+
+for (bill, has_coord, actual_coord_cost, base_sum, expected_coord, difference,
+     within_tolerance) in summary.itertuples():
+
+    if not has_coord:
+        report.append(f"⚠ No coordination charge found for Bill {bill}\n")
         continue
 
-    actual_coord_cost = coord_rows["Cost"].sum()
-
-    # Exclude Supervisor, Miscellaneous, Coordination rows
-    base_df = bill_df[
-        ~bill_df["Work"].str.contains("Supervisor", case=False, na=False) &
-        ~bill_df["Work"].str.contains("Misc", case=False, na=False) &
-        ~bill_df["Work"].str.contains("coordination", case=False, na=False) &
-        ~bill_df["Work code"].astype(str).str.startswith("C")
-    ]
-
-    base_sum = base_df["Cost"].sum()
-
-    expected_coord = base_sum * 0.15
+    report.append(
+        f"Bill {bill}:\n"
+        f"Base Amount = {base_sum:.2f}\n"
+        f"Expected 15% = {expected_coord:.2f}\n"
+        f"Actual Coordination = {actual_coord_cost:.2f}\n"
+        f"Difference = {difference:.2f}\n"
+    )
 
-    difference = abs(expected_coord - actual_coord_cost)
-
-    print(f"Bill {bill}:")
-    print(f"Base Amount = {base_sum:.2f}")
-    print(f"Expected 15% = {expected_coord:.2f}")
-    print(f"Actual Coordination = {actual_coord_cost:.2f}")
-    print(f"Difference = {difference:.2f}")
-
-    if difference <= tolerance:
-        print("✅ Coordination charge is correct within tolerance.\n")
+    if within_tolerance:
+        report.append("✅ Coordination charge is correct within tolerance.\n\n")
     else:
-        print("❌ Coordination charge mismatch!\n")
+        report.append("❌ Coordination charge mismatch!\n\n")
+
+sys.stdout.write("".join(report))
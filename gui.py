@@ -4,13 +4,237 @@ Handles the user interface and display – combines check icons and human‑frie
 """
 
 import tkinter as tk
-from tkinter import scrolledtext, messagebox, filedialog
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+import logging
 import os
-from validator import BillValidator
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+# File dialog filter for the input files
+_CSV_FILETYPES = (("CSV files", "*.csv"), ("All files", "*.*"))
+
+# Report building blocks, built once rather than on every format_output call
+_SEP40 = "-"*40 + "\n"
+_SEP60 = "="*60 + "\n"
+_BILL_SEP = "  " + "-"*50 + "\n"
+_ISSUES_SEP = "-"*60 + "\n"
+
+# Human‑readable base names
+_CHECK_NAMES = {
+    'columns_present': 'Required columns exist',
+    'no_missing_values': 'No empty cells in required columns',
+    'allowed_values': 'Values from allowed list',
+    'numeric_values': 'Numeric columns contain only numbers',
+    'work_pairs_valid': 'Work code/name pairs are valid',
+}
+
+# Per-check report lines, indexed by the check result: (fail line, pass line)
+_CHECK_LINES = {
+    name: (f"  ❌ {label}\n", f"  ✅ {label}\n")
+    for name, label in _CHECK_NAMES.items()
+}
+_CHECK_LINES['work_pairs_missing_only'] = (
+    "  ❌ Work code/name (missing values only)\n",
+    "  ✅ Work code/name (missing values only)\n",
+)
+
+# Coordination block per bill, keyed by (has_coordination, coordination_correct):
+# a sequence of (template, tag) pieces filled from the bill's coordination details
+_COORD_DETAIL = (
+    "     Base amount (after exclusions): ₹{base:.2f}\n"
+    "     {percent}% of base = ₹{expected:.2f}\n"
+)
+_COORD_SKIPPED = (("  ⚠️  No coordination charge (skipped)\n", "orange"),)
+_COORD_BLOCKS = {
+    (True, True): (
+        ("  ✅ Coordination charge correct\n" + _COORD_DETAIL
+         + "     Actual coordination: ₹{actual:.2f} (matches expected)\n", None),
+    ),
+    (True, False): (
+        ("  ❌ Coordination charge incorrect\n" + _COORD_DETAIL, None),
+        ("     Actual coordination: ₹{actual:.2f} (Difference: ₹{diff:.2f})\n", "red"),
+    ),
+    (False, True): _COORD_SKIPPED,
+    (False, False): _COORD_SKIPPED,
+}
+
+# Validation rules summary; only the coordination rule depends on the run
+_RULES_HEAD = (
+    "  • All required columns must exist.\n"
+    "  • No empty cells in required columns (unless explicitly allowed).\n"
+)
+_RULE_COORDINATION = "  • Coordination charge must be exactly {percent}% of the base amount (within ±{tolerance}).\n"
+_RULES_TAIL = (
+    "  • Values in certain columns must be from a predefined list.\n"
+    "  • Cost, Rate per unit, and Quantity must contain only numbers.\n"
+)
+_RULE_WORK_PAIRS = "  • Every (Work code, Work name) pair must match the reference file, and neither field may be empty.\n"
+_RULE_WORK_MISSING_ONLY = "  • Work code and Work name must not be empty (pair validation skipped because no reference file provided).\n"
+
+# The final summary names at most this many bills per list
+_SUMMARY_BILL_LIMIT = 200
+
+
+def _bill_list(bills, limit):
+    """Comma-separated bill numbers for the summary, capped at limit (None: all)."""
+    if limit is None or len(bills) <= limit:
+        return ', '.join(bills)
+    return f"{', '.join(bills[:limit])} … ({len(bills) - limit} more)"
+
+
+def _summary_count(label, bills, limit):
+    """One summary line: the label, how many bills it covers and which ones."""
+    if not bills:
+        return f"{label}: 0 bills\n"
+    plural = "s" if len(bills) != 1 else ""
+    return f"{label}: {len(bills)} bill{plural} - {_bill_list(bills, limit)}\n"
+
+
+def _final_summary(total_bills, passed_bills, failed_bills, limit=_SUMMARY_BILL_LIMIT):
+    """The final summary block; limit caps each bill list (None lists every bill)."""
+    return (
+        _SEP60 + "📊 FINAL SUMMARY\n" + _SEP60 +
+        f"Total bills processed: {total_bills}\n"
+        f"{_summary_count('✅ PASSED', passed_bills, limit)}"
+        f"{_summary_count('❌ FAILED', failed_bills, limit)}"
+        f"\n{len(passed_bills)} out of {total_bills} bills passed.\n")
+
+
+# Failure-detail formatters: each turns one non-empty section of a bill's
+# details into report lines
+def _missing_value_lines(missing):
+    return [f"  • Column '{col}' has empty cells at row(s): {', '.join(map(str, rows))}"
+            for col, rows in missing.items()]
+
+
+def _allowed_violation_lines(allowed_violations):
+    lines = []
+    for col, vals in allowed_violations.items():
+        vals_str = ', '.join(f"'{v}'" for v in vals)
+        lines.append(f"  • Column '{col}' contains invalid values: {vals_str}")
+    return lines
+
+
+def _numeric_violation_lines(numeric_violations):
+    return [f"  • Column '{col}' has non‑numeric entries at row(s): {', '.join(map(str, rows))}"
+            for col, rows in numeric_violations.items()]
+
+
+def _work_pair_lines(work_violations):
+    if 'missing_columns' in work_violations:
+        return [f"  • Missing required columns: {', '.join(work_violations['missing_columns'])}"]
+    lines = []
+    missing_code = work_violations.get('missing_code', [])
+    missing_name = work_violations.get('missing_name', [])
+    if missing_code:
+        lines.append(f"  • Missing work code at row(s): {', '.join(map(str, missing_code))}")
+    if missing_name:
+        lines.append(f"  • Missing work name at row(s): {', '.join(map(str, missing_name))}")
+    for pair_key, rows in work_violations.get('invalid_pairs', {}).items():
+        code, name = pair_key.split('|', 1)
+        lines.append(f"  • Invalid pair (code: '{code}', work: '{name}') at row(s): {', '.join(map(str, rows))}")
+    return lines
+
+
+# Details key -> formatter, in report order
+_DETAIL_FORMATTERS = (
+    ("missing_values", _missing_value_lines),
+    ("allowed_violations", _allowed_violation_lines),
+    ("numeric_violations", _numeric_violation_lines),
+    ("work_pair_violations", _work_pair_lines),
+)
 
 class BillValidationGUI:
     """Main GUI class for the Bill Validation Tool"""
 
+    # Large reports are rendered in chunks of bill blocks, each inserted from
+    # the event loop so the window stays responsive. The first page goes in
+    # straight away; further chunks are added as the box is scrolled to the end.
+    _BILL_CHUNK = 50
+    _BILL_PAGE = 200
+
+    # Welcome text shown on start-up and by Refresh (built once, at class load)
+    _INSTRUCTIONS = """\
+📋 **WELCOME TO THE BILL VALIDATION TOOL**
+
+This tool checks your bill CSV file against a set of validation rules.  
+Follow the steps below to prepare your data and run the check.
+
+---
+
+## STEP 1: UNDERSTAND THE TEMPLATE FILES
+
+Four CSV files are used (default names are shown in the entry fields above).  
+**You must keep the column headings exactly as they appear in these templates.**  
+You can modify the data rows (copy/paste your own data) but **do not change the header row**.
+
+| File              | Purpose                                                                                   | Required Columns (examples)                          |
+|-------------------|-------------------------------------------------------------------------------------------|------------------------------------------------------|
+| `Bill.csv`        | The actual bill data you want to validate.                                                | Contract Bill No, Item, Work code, Work, Cost, ...   |
+| `Exclude.csv`     | **Exclusion conditions** – each row defines a set of column‑value pairs.                  | Any columns present in the bill; rows with **all** matching values are excluded from the coordination base amount. |
+| `Valuecheck.csv`  | Defines which values are allowed in each column (mandatory).                              | One column per required field (e.g. Contract Bill No)|
+| `Workcode.csv`    | Reference list of valid (Work code, Work) pairs (optional, but recommended).             | Work code, Work, Start, End                           |
+
+---
+
+## STEP 2: PREPARE YOUR DATA
+
+1. **Open each template file** in a spreadsheet editor (Excel, LibreOffice, etc.) or a text editor.
+2. **Keep the first row (headers) untouched**.
+3. **Paste your data starting from row 2**.  
+   - For `Bill.csv`, paste your bill rows.
+   - For `Exclude.csv`, list **exclusion conditions**.  
+     * Each row defines one condition. A bill row is excluded **only if it matches all the columns you fill in that row**.  
+     * For example, a row with `Work code = S` excludes all rows with Work code 'S'.  
+     * A row with `Work = Site` and `Item = Cement` excludes only rows where both Work is 'Site' **and** Item is 'Cement'.  
+     * Empty cells are ignored (they do not form part of the condition).
+   - For `Valuecheck.csv`, list **all allowed values** for each column.  
+     * Use `any` if any non‑empty value is allowed.  
+     * Use `blank` if empty cells are allowed.  
+     * Otherwise, list every permissible value (one per row).
+   - For `Workcode.csv`, list all valid work‑code / work‑name pairs (optional).
+4. **Save the files** as CSV (comma‑separated values). Keep them in the same folder as this program, or use the Browse buttons to select them.
+
+---
+
+## STEP 3: SET THE COORDINATION PERCENTAGE
+
+Enter the percentage used for coordination charge (e.g., 15 for 15%).  
+The tool will check that the coordination charge row equals exactly this percentage of the base amount (after applying exclusions).
+
+---
+
+## STEP 4: RUN THE VALIDATION
+
+Click the **Run Check** button. The tool will:
+
+- Verify that all required columns exist.
+- Check for empty cells (unless `blank` is allowed).
+- Validate that values belong to the allowed lists.
+- Ensure numeric columns contain only numbers.
+- If a work‑code reference file is provided, verify every (Work code, Work) pair.
+- Calculate the expected coordination charge and compare it with the actual value.
+
+---
+
+## STEP 5: INTERPRET THE RESULTS
+
+- **Green checkmarks (✅)** indicate passed checks.
+- **Red crosses (❌)** indicate failures.
+- **Orange warning (⚠️)** indicates that a check was skipped (e.g., no coordination charge).
+- Detailed failure explanations are shown in **red text** below each bill.
+- A final summary shows how many bills passed/failed.
+
+If you need to run another check, click **Refresh** to clear the output and return to these instructions.
+
+---
+
+**Need help?** Make sure your CSV files use the correct column headers and that the data is properly formatted.  
+If you see unexpected errors, check the console for more details.
+"""
+
     def __init__(self, root):
         self.root = root
         self.root.title("Bill Validation Tool")
@@ -23,382 +247,455 @@ class BillValidationGUI:
         self.workcode_file_path = tk.StringVar(value="Workcode.csv")
         self.coordination_percent = tk.StringVar(value="15")
 
+        # Messages from the validation worker thread, drained on the Tk thread
+        self.progress_queue = queue.Queue()
+        self._last_progress_ts = 0.0
+        self._showing_instructions = False
+        # Parsed input CSVs kept between runs (see BillValidator's csv_cache)
+        self._csv_cache = OrderedDict()
+        # Report chunks not yet rendered: (bill rows, next index, percent, work-pair lines)
+        self._pending_bills = None
+        self._more_bills_job = None
+        # Last report, for Save Report: (head segments, bill rows, percent,
+        # work-pair lines, tail segments); None while the instructions are shown
+        self._report = None
+
         self.setup_ui()
+        # One open-file dialog, reused by every Browse button
+        self._file_dialog = filedialog.Open(self.root, filetypes=_CSV_FILETYPES)
         self.refresh_output()
+        # The validator pulls in pandas; import it in the background so the
+        # window comes up first and the first Run Check does not wait as long
+        threading.Thread(target=__import__, args=("validator",), daemon=True).start()
 
     def setup_ui(self):
+        # Fonts and colours live in one ttk style instead of on every widget
+        style = ttk.Style(self.root)
+        style.configure("TLabel", font=("Arial", 10))
+        style.configure("Title.TLabel", font=("Arial", 16, "bold"))
+        style.configure("Hint.TLabel", font=("Arial", 9), foreground="gray")
+        style.configure("Action.TButton", font=("Arial", 12))
+
+        # All widgets are built into one frame that is packed into the window
+        # at the end, so the window lays them out in a single geometry pass
+        container = ttk.Frame(self.root)
+
         # Title
-        title = tk.Label(self.root, text="Bill Validation Tool",
-                        font=("Arial", 16, "bold"))
+        title = ttk.Label(container, text="Bill Validation Tool", style="Title.TLabel")
         title.pack(pady=10)
 
         # File selection frames
-        file_frame = tk.Frame(self.root)
+        file_frame = ttk.Frame(container)
         file_frame.pack(pady=5, fill="x", padx=20)
 
-        # Bill CSV
-        bill_label = tk.Label(file_frame, text="Bill CSV File:", font=("Arial", 10))
-        bill_label.grid(row=0, column=0, sticky="w", pady=5)
-        bill_entry = tk.Entry(file_frame, textvariable=self.bill_file_path,
-                              font=("Arial", 10), width=60)
-        bill_entry.grid(row=0, column=1, padx=5, pady=5)
-        bill_browse = tk.Button(file_frame, text="Browse...",
-                                command=self.browse_bill_file)
-        bill_browse.grid(row=0, column=2, padx=5, pady=5)
-
-        # Exclude patterns
-        exclude_label = tk.Label(file_frame, text="Exclude Patterns File:", font=("Arial", 10))
-        exclude_label.grid(row=1, column=0, sticky="w", pady=5)
-        exclude_entry = tk.Entry(file_frame, textvariable=self.exclude_file_path,
-                                 font=("Arial", 10), width=60)
-        exclude_entry.grid(row=1, column=1, padx=5, pady=5)
-        exclude_browse = tk.Button(file_frame, text="Browse...",
-                                   command=self.browse_exclude_file)
-        exclude_browse.grid(row=1, column=2, padx=5, pady=5)
-
-        # Allowed values (mandatory)
-        allowed_label = tk.Label(file_frame, text="Allowed Values File:", font=("Arial", 10))
-        allowed_label.grid(row=2, column=0, sticky="w", pady=5)
-        allowed_entry = tk.Entry(file_frame, textvariable=self.allowed_file_path,
-                                 font=("Arial", 10), width=60)
-        allowed_entry.grid(row=2, column=1, padx=5, pady=5)
-        allowed_browse = tk.Button(file_frame, text="Browse...",
-                                   command=self.browse_allowed_file)
-        allowed_browse.grid(row=2, column=2, padx=5, pady=5)
-
-        # Work code reference file (optional)
-        workcode_label = tk.Label(file_frame, text="Work Code Reference File:", font=("Arial", 10))
-        workcode_label.grid(row=3, column=0, sticky="w", pady=5)
-        workcode_entry = tk.Entry(file_frame, textvariable=self.workcode_file_path,
-                                   font=("Arial", 10), width=60)
-        workcode_entry.grid(row=3, column=1, padx=5, pady=5)
-        workcode_browse = tk.Button(file_frame, text="Browse...",
-                                    command=self.browse_workcode_file)
-        workcode_browse.grid(row=3, column=2, padx=5, pady=5)
+        # One row per input file: (label, path variable, file dialog title)
+        file_rows = (
+            ("Bill CSV File:", self.bill_file_path, "Select Bill CSV File"),
+            ("Exclude Patterns File:", self.exclude_file_path,
+             "Select Exclude Patterns CSV File"),
+            # Allowed values (mandatory)
+            ("Allowed Values File:", self.allowed_file_path,
+             "Select Allowed Values CSV File"),
+            # Work code reference file (optional)
+            ("Work Code Reference File:", self.workcode_file_path,
+             "Select Work Code Reference CSV File"),
+        )
+        for row, (label_text, var, dialog_title) in enumerate(file_rows):
+            ttk.Label(file_frame, text=label_text).grid(row=row, column=0, sticky="w", pady=5)
+            ttk.Entry(file_frame, textvariable=var, font=("Arial", 10),
+                      width=60).grid(row=row, column=1, padx=5, pady=5)
+            ttk.Button(file_frame, text="Browse...",
+                       command=lambda t=dialog_title, v=var: self._browse(t, v)
+                       ).grid(row=row, column=2, padx=5, pady=5)
 
         # Percentage
-        percent_frame = tk.Frame(self.root)
+        percent_frame = ttk.Frame(container)
         percent_frame.pack(pady=5, fill="x", padx=20)
-        percent_label = tk.Label(percent_frame, text="Coordination Percentage (%):", font=("Arial", 10))
+        percent_label = ttk.Label(percent_frame, text="Coordination Percentage (%):")
         percent_label.grid(row=0, column=0, sticky="w", pady=5)
-        percent_entry = tk.Entry(percent_frame, textvariable=self.coordination_percent,
-                                 font=("Arial", 10), width=10)
+        percent_entry = ttk.Entry(percent_frame, textvariable=self.coordination_percent,
+                                  font=("Arial", 10), width=10)
         percent_entry.grid(row=0, column=1, sticky="w", padx=5, pady=5)
-        hint_label = tk.Label(percent_frame, text="(e.g., 15 for 15%)", font=("Arial", 9), fg="gray")
+        hint_label = ttk.Label(percent_frame, text="(e.g., 15 for 15%)", style="Hint.TLabel")
         hint_label.grid(row=0, column=2, sticky="w", padx=5, pady=5)
 
         # Buttons
-        button_frame = tk.Frame(self.root)
+        button_frame = ttk.Frame(container)
         button_frame.pack(pady=5)
-        self.run_button = tk.Button(button_frame, text="Run Check",
-                                    font=("Arial", 12), width=15,
-                                    command=self.run_check)
+        self.run_button = ttk.Button(button_frame, text="Run Check",
+                                     style="Action.TButton", width=15,
+                                     command=self.run_check)
         self.run_button.grid(row=0, column=0, padx=10)
-        self.refresh_button = tk.Button(button_frame, text="Refresh",
-                                       font=("Arial", 12), width=15,
-                                       command=self.refresh_output)
+        self.refresh_button = ttk.Button(button_frame, text="Refresh",
+                                         style="Action.TButton", width=15,
+                                         command=self.refresh_output)
         self.refresh_button.grid(row=0, column=1, padx=10)
+        self.save_button = ttk.Button(button_frame, text="Save Report",
+                                      style="Action.TButton", width=15,
+                                      command=self.save_report)
+        self.save_button.grid(row=0, column=2, padx=10)
 
         # Progress
-        self.progress_label = tk.Label(self.root, text="", font=("Arial", 10))
+        self.progress_label = ttk.Label(container, text="")
         self.progress_label.pack(pady=5)
 
         # Output
-        self.output_box = scrolledtext.ScrolledText(self.root, wrap=tk.WORD,
-                                                    width=110, height=30)
+        # Read-only report view: no undo history is kept for the bulk writes
+        self.output_box = scrolledtext.ScrolledText(container, wrap=tk.WORD,
+                                                    width=110, height=30,
+                                                    undo=False, maxundo=0,
+                                                    autoseparators=False)
         self.output_box.pack(padx=10, pady=10, fill="both", expand=True)
+        # Route scrollbar updates through the paging hook for large reports
+        self.output_box.configure(yscrollcommand=self._on_output_scroll)
+        # The box stays disabled between writes; take focus on click so the
+        # report can still be selected and copied
+        self.output_box.bind("<1>", lambda e: self.output_box.focus_set())
+
+        container.pack(fill="both", expand=True)
 
         # Configure tags
         self.output_box.tag_configure("red", foreground="red")
         self.output_box.tag_configure("orange", foreground="darkorange")
         self.output_box.tag_configure("warning", foreground="darkorange")
 
-    def browse_bill_file(self):
-        filename = filedialog.askopenfilename(
-            title="Select Bill CSV File",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-        )
-        if filename:
-            self.bill_file_path.set(filename)
-
-    def browse_exclude_file(self):
-        filename = filedialog.askopenfilename(
-            title="Select Exclude Patterns CSV File",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-        )
+    def _browse(self, title, var):
+        """Ask for a CSV file and store the chosen path in var."""
+        # The dialog remembers the last folder; the last file name is not carried over
+        filename = self._file_dialog.show(title=title, initialfile="")
         if filename:
-            self.exclude_file_path.set(filename)
+            var.set(filename)
 
-    def browse_allowed_file(self):
-        filename = filedialog.askopenfilename(
-            title="Select Allowed Values CSV File",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-        )
-        if filename:
-            self.allowed_file_path.set(filename)
+    def update_progress(self, current, total, bill_number):
+        """Progress callback for the validator (called on the worker thread).
+        Throttled to ~30 updates per second; the last bill is always reported."""
+        now = time.monotonic()
+        if current != total and now - self._last_progress_ts < 0.033:
+            return
+        self._last_progress_ts = now
+        self.progress_queue.put(("progress", current, total, bill_number))
 
-    def browse_workcode_file(self):
-        filename = filedialog.askopenfilename(
-            title="Select Work Code Reference CSV File",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-        )
-        if filename:
-            self.workcode_file_path.set(filename)
+    def _worker(self, validator):
+        """Run the validation off the Tk thread and post the outcome to the queue."""
+        try:
+            result = validator.load_and_validate(progress_callback=self.update_progress)
+        except Exception as e:
+            self.progress_queue.put(("error", e))
+        else:
+            self.progress_queue.put(("done", result))
 
-    def update_progress(self, current, total, bill_number):
-        self.progress_label.config(
-            text=f"Processing bill {current} of {total}: Bill {bill_number}"
-        )
-        self.root.update()
+    def _poll_progress(self, percent):
+        """Drain worker messages on the Tk thread, rescheduling until the run ends."""
+        try:
+            while True:
+                message = self.progress_queue.get_nowait()
+                if message[0] == "progress":
+                    _, current, total, bill_number = message
+                    self.progress_label.config(
+                        text=f"Processing bill {current} of {total}: Bill {bill_number}"
+                    )
+                elif message[0] == "done":
+                    self.run_button.config(state="normal")
+                    self.format_output(message[1], percent)
+                    return
+                else:
+                    self.run_button.config(state="normal")
+                    self.progress_label.config(text="")
+                    messagebox.showerror("Error", f"Validation failed:\n{message[1]}")
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(50, self._poll_progress, percent)
+
+    @staticmethod
+    def _insert_args(segments):
+        """Flatten (text, tag) segments into variadic insert arguments
+        (text, tags, text, tags, ...), joining consecutive segments sharing a tag."""
+        runs = []
+        for text, tag in segments:
+            if runs and runs[-1][1] == tag:
+                runs[-1][0].append(text)
+            else:
+                runs.append(([text], tag))
+        args = []
+        for texts, tag in runs:
+            args.append("".join(texts))
+            args.append(tag or ())
+        return args
+
+    def _write_segments(self, segments, tail=()):
+        """Replace the output box contents with (text, tag) segments.
+        All runs go to Tk in a single variadic insert. Tags are attached by the
+        insert rather than by tag_add over character offsets afterwards: Tk 8.6
+        counts an emoji as two index positions, so offsets counted in Python
+        drift on the icon-heavy report lines.
+        The optional tail segments follow a "bills_end" mark, where later chunks
+        of bill blocks are inserted (see _render_more_bills)."""
+        self._pending_bills = None
+        self._report = None
+        args = self._insert_args(segments)
+
+        # Detach the scrollbar while writing so it is updated once, not per insert.
+        # The insert mark is parked at the top afterwards so the (read-only) box
+        # opens on the first line instead of tracking the end of the text.
+        yscroll = self.output_box.cget("yscrollcommand")
+        self.output_box.configure(state="normal", yscrollcommand="")
+        self.output_box.delete(1.0, tk.END)
+        if args:
+            self.output_box.insert(tk.END, *args)
+        if tail:
+            # Left gravity keeps the mark ahead of the tail inserted at it; right
+            # gravity afterwards makes chunks inserted at the mark append in order
+            self.output_box.mark_set("bills_end", "end-1c")
+            self.output_box.mark_gravity("bills_end", tk.LEFT)
+            self.output_box.insert(tk.END, *self._insert_args(tail))
+            self.output_box.mark_gravity("bills_end", tk.RIGHT)
+        self.output_box.mark_set(tk.INSERT, "1.0")
+        self.output_box.configure(state="disabled", yscrollcommand=yscroll)
+
+    def _on_output_scroll(self, first, last):
+        """Scrollbar update for the output box; near the bottom of a paged
+        report, queue the next chunk of bill blocks."""
+        self.output_box.vbar.set(first, last)
+        if self._pending_bills and float(last) >= 0.95:
+            self._schedule_more_bills(self.root.after_idle)
+
+    def _schedule_more_bills(self, scheduler, *delay):
+        """Queue _render_more_bills on the event loop unless a call is already queued."""
+        if self._more_bills_job is None:
+            self._more_bills_job = scheduler(*delay, self._render_more_bills)
+
+    def _render_more_bills(self):
+        """Insert the next chunk of bill blocks ahead of the final summary."""
+        self._more_bills_job = None
+        if not self._pending_bills:
+            return
+        bill_rows, start, percent_used, work_pairs_lines = self._pending_bills
+        stop = start + self._BILL_CHUNK
+        segments = []
+
+        def write(text, tag=None):
+            segments.append((text, tag))
+
+        for row in bill_rows[start:stop]:
+            self._render_bill(write, row, percent_used, work_pairs_lines)
+        self._pending_bills = (
+            (bill_rows, stop, percent_used, work_pairs_lines)
+            if stop < len(bill_rows) else None)
+
+        self.output_box.configure(state="normal")
+        self.output_box.insert("bills_end", *self._insert_args(segments))
+        self.output_box.configure(state="disabled")
+        # Keep going on our own until the first page is in; past that, scrolling drives it
+        if self._pending_bills and stop < self._BILL_PAGE:
+            self._schedule_more_bills(self.root.after, 0)
 
     def format_output(self, validation_result, percent_used):
         """Format validation results with check icons and detailed failure explanations."""
-        self.output_box.delete(1.0, tk.END)
+        segments = []   # (text, tag) pairs, written to the widget in one pass
+        self._showing_instructions = False
+
+        def write(text, tag=None):
+            segments.append((text, tag))
 
         if not validation_result["global_columns_ok"]:
-            self.output_box.insert(tk.END,
+            write(
                 "❌ MISSING COLUMNS\n" +
-                "="*60 + "\n" +
+                _SEP60 +
                 f"The following required columns are missing from the bill file:\n" +
                 f"   {', '.join(validation_result['missing_columns'])}\n\n")
+            self._write_segments(segments)
+            self._report = (segments, (), percent_used, None, None)
             return
 
-        self.output_box.insert(tk.END,
+        write(
             "✅ COLUMN CHECK PASSED\n" +
-            "="*60 + "\n" +
+            _SEP60 +
             "All required columns are present in the bill file.\n\n")
 
         # Exclusion conditions
         exclude_conds = validation_result.get("exclude_conditions", [])
         if exclude_conds:
-            self.output_box.insert(tk.END, "📋 EXCLUSION CONDITIONS\n")
-            self.output_box.insert(tk.END, "-"*40 + "\n")
-            for cond in exclude_conds:
-                cond_str = " AND ".join(f"{col} = '{val}'" for col, val in cond.items())
-                self.output_box.insert(tk.END, f"   • {cond_str}\n")
-            self.output_box.insert(tk.END, "\n")
+            write("📋 EXCLUSION CONDITIONS\n")
+            write(_SEP40)
+            write("".join([
+                "   • " + " AND ".join([f"{col} = '{val}'" for col, val in cond.items()]) + "\n"
+                for cond in exclude_conds
+            ]))
+            write("\n")
 
         # Allowed values
         allowed_dict = validation_result["allowed_dict"]
+        allowed_display = validation_result["allowed_display"]
         if allowed_dict:
-            self.output_box.insert(tk.END, "📋 ALLOWED VALUES PER COLUMN\n")
-            self.output_box.insert(tk.END, "-"*40 + "\n")
-            for col, values in sorted(allowed_dict.items()):
-                if 'any' in values and len(values) == 1:
+            write("📋 ALLOWED VALUES PER COLUMN\n")
+            write(_SEP40)
+            # The validator keeps columns in file order, so they are sorted here by
+            # name only (no (name, set) tuple comparisons)
+            parts = []
+            for col in sorted(allowed_dict):
+                values = allowed_dict[col]
+                has_any = 'any' in values
+                has_blank = 'blank' in values
+                single = len(values) == 1
+                if has_any and single:
                     desc = "any value allowed"
-                elif 'blank' in values and len(values) == 1:
+                elif has_blank and single:
                     desc = "empty cells allowed"
                 else:
-                    display_vals = [v for v in values if v not in ('any','blank')]
-                    desc = f"must be one of: {', '.join(sorted(display_vals))}"
-                    if 'blank' in values:
+                    desc = f"must be one of: {', '.join(allowed_display[col])}"
+                    if has_blank:
                         desc += " (empty cells also allowed)"
-                    if 'any' in values:
+                    if has_any:
                         desc += " (any non‑empty value allowed)"
-                self.output_box.insert(tk.END, f"   {col}: {desc}\n")
-            self.output_box.insert(tk.END, "\n")
+                parts.append(f"   {col}: {desc}\n")
+            parts.append("\n")
+            write("".join(parts))
 
-        # Work code reference file issues
         # Work code reference file issues
         work_issues = validation_result.get('work_code_issues')
         if work_issues:
-            self.output_box.insert(tk.END, "⚠️  WORK CODE REFERENCE FILE ISSUES\n", "red")
-            self.output_box.insert(tk.END, "-"*60 + "\n", "red")
-            details_red = ""
+            write("⚠️  WORK CODE REFERENCE FILE ISSUES\n", "red")
+            write(_ISSUES_SEP, "red")
+            details_red = []
             if work_issues.get('missing_code_rows'):
-                rows = ', '.join(str(r) for r in work_issues['missing_code_rows'])
-                details_red += f"   • Missing work code at row(s): {rows}\n"
+                rows = ', '.join(map(str, work_issues['missing_code_rows']))
+                details_red.append(f"   • Missing work code at row(s): {rows}\n")
             if work_issues.get('missing_name_rows'):
-                rows = ', '.join(str(r) for r in work_issues['missing_name_rows'])
-                details_red += f"   • Missing work name at row(s): {rows}\n"
+                rows = ', '.join(map(str, work_issues['missing_name_rows']))
+                details_red.append(f"   • Missing work name at row(s): {rows}\n")
             if work_issues.get('name_with_multiple_codes'):
-                details_red += "   • Work name appears with multiple different work codes:\n"
+                details_red.append("   • Work name appears with multiple different work codes:\n")
                 for name, data in work_issues['name_with_multiple_codes'].items():
                     codes_str = ', '.join(data['codes'])
-                    rows_str = ', '.join(str(r) for r in data['rows'])
-                    details_red += f"       '{name}' with codes {codes_str} at rows: {rows_str}\n"
-            self.output_box.insert(tk.END, details_red, "red")
-            self.output_box.insert(tk.END, "\n")
+                    rows_str = ', '.join(map(str, data['rows']))
+                    details_red.append(f"       '{name}' with codes {codes_str} at rows: {rows_str}\n")
+            write("".join(details_red), "red")
+            write("\n")
 
 
         # Validation rules summary
-        self.output_box.insert(tk.END, "📋 VALIDATION RULES\n")
-        self.output_box.insert(tk.END, "-"*40 + "\n")
-        rules = [
-            "• All required columns must exist.",
-            "• No empty cells in required columns (unless explicitly allowed).",
-            f"• Coordination charge must be exactly {percent_used}% of the base amount (within ±{validation_result.get('tolerance',10)}).",
-            "• Values in certain columns must be from a predefined list.",
-            "• Cost, Rate per unit, and Quantity must contain only numbers."
-        ]
-        if validation_result.get('work_pairs_checked', False):
-            rules.append("• Every (Work code, Work name) pair must match the reference file, and neither field may be empty.")
+        write("📋 VALIDATION RULES\n")
+        write(_SEP40)
+        write(_RULES_HEAD)
+        write(_RULE_COORDINATION.format(percent=percent_used,
+                                        tolerance=validation_result.get('tolerance', 10)))
+        write(_RULES_TAIL)
+        work_pairs_checked = validation_result.get('work_pairs_checked', False)
+        if work_pairs_checked:
+            write(_RULE_WORK_PAIRS)
         else:
-            rules.append("• Work code and Work name must not be empty (pair validation skipped because no reference file provided).")
-        for rule in rules:
-            self.output_box.insert(tk.END, f"  {rule}\n")
-        self.output_box.insert(tk.END, "\n")
+            write(_RULE_WORK_MISSING_ONLY)
+        write("\n")
 
         total_bills = validation_result['total_bills']
-        self.output_box.insert(tk.END,
+        write(
             f"🔍 ANALYZING {total_bills} BILL{'S' if total_bills!=1 else ''} "
             f"(coordination = {percent_used}%)\n\n")
 
         passed_bills = []
         failed_bills = []
+        work_pairs_lines = _CHECK_LINES[
+            'work_pairs_valid' if work_pairs_checked else 'work_pairs_missing_only']
 
-        # Human‑readable base names
-        base_check_names = {
-            'columns_present': 'Required columns exist',
-            'no_missing_values': 'No empty cells in required columns',
-            'allowed_values': 'Values from allowed list',
-            'numeric_values': 'Numeric columns contain only numbers',
-            'work_pairs_valid': 'Work code/name pairs are valid',
-        }
-
+        # Pass/fail is decided for every bill up front (the summary lists all of
+        # them); the bill blocks themselves are rendered a chunk at a time
+        bill_rows = []
         for bill, result in validation_result["results"].items():
-            checks = result["checks"]
-            details = result["details"]
-            coord_info = details.get("coordination", {})
-
             # Determine bill pass/fail (coordination check always passes if no coordination row)
-            all_checks_pass = all(checks.values())  # coordination_correct is True when no coordination
+            all_checks_pass = all(result["checks"].values())  # coordination_correct is True when no coordination
 
+            # Bill numbers are stringified once, for the heading and the summary lists
+            bill_str = str(bill)
             if all_checks_pass:
-                passed_bills.append(bill)
+                passed_bills.append(bill_str)
             else:
-                failed_bills.append(bill)
-
-            status = "✅ PASS" if all_checks_pass else "❌ FAIL"
-            self.output_box.insert(tk.END, f"{status}  Bill {bill}\n")
-            self.output_box.insert(tk.END, "  " + "-"*50 + "\n")
-
-            # ---- List all checks with appropriate symbols and text ----
-            # Columns present
-            icon = "✅" if checks.get('columns_present') else "❌"
-            self.output_box.insert(tk.END, f"  {icon} {base_check_names['columns_present']}\n")
-
-            # No missing values
-            icon = "✅" if checks.get('no_missing_values') else "❌"
-            self.output_box.insert(tk.END, f"  {icon} {base_check_names['no_missing_values']}\n")
+                failed_bills.append(bill_str)
+            bill_rows.append((bill_str, result, all_checks_pass))
 
-            # Allowed values
-            icon = "✅" if checks.get('allowed_values') else "❌"
-            self.output_box.insert(tk.END, f"  {icon} {base_check_names['allowed_values']}\n")
-
-            # Numeric values
-            icon = "✅" if checks.get('numeric_values') else "❌"
-            self.output_box.insert(tk.END, f"  {icon} {base_check_names['numeric_values']}\n")
-
-            # Work pairs valid (or missing values only)
-            if validation_result.get('work_pairs_checked', False):
-                icon = "✅" if checks.get('work_pairs_valid') else "❌"
-                self.output_box.insert(tk.END, f"  {icon} {base_check_names['work_pairs_valid']}\n")
-            else:
-                # No reference file: only check missing values, which is included in work_pairs_valid check
-                icon = "✅" if checks.get('work_pairs_valid') else "❌"
-                self.output_box.insert(tk.END, f"  {icon} Work code/name (missing values only)\n")
-
-            # Coordination charge – special handling
-            if coord_info.get('has_coordination', False):
-                # There is a coordination row: show correct/incorrect
-                passed = checks.get('coordination_correct', False)
-                icon = "✅" if passed else "❌"
-                text = "Coordination charge correct" if passed else "Coordination charge incorrect"
-                self.output_box.insert(tk.END, f"  {icon} {text}\n")
-            else:
-                # No coordination row: show warning and pass
-                self.output_box.insert(tk.END, "  ⚠️  No coordination charge (skipped)\n", "orange")
-
-            # ---- Detailed coordination calculation (if exists) ----
-            if coord_info.get('has_coordination', False):
-                base = coord_info.get('base_amount', 0)
-                expected = coord_info.get('expected', 0)
-                actual = coord_info.get('actual_coord', 0)
-                self.output_box.insert(tk.END, f"     Base amount (after exclusions): ₹{base:.2f}\n")
-                self.output_box.insert(tk.END, f"     {percent_used}% of base = ₹{expected:.2f}\n")
-                if checks.get('coordination_correct', True):
-                    self.output_box.insert(tk.END, f"     Actual coordination: ₹{actual:.2f} (matches expected)\n")
-                else:
-                    diff = coord_info.get('diff', 0)
-                    self.output_box.insert(tk.END, f"     Actual coordination: ₹{actual:.2f} (Difference: ₹{diff:.2f})\n", "red")
-                if coord_info.get("excluded_items"):
-                    self.output_box.insert(tk.END, f"     Excluded from base amount:\n")
-                    for item in coord_info["excluded_items"]:
-                        self.output_box.insert(tk.END, f"        - {item['Item']} (Code: {item['Work code']}): ₹{item['Cost']:.2f}\n")
-
-            # ---- Detailed failure explanations (non‑coordination) ----
-            failure_details = []
-
-            # Missing values
-            missing = details.get("missing_values", {})
-            if missing:
-                for col, rows in missing.items():
-                    rows_str = ', '.join(str(r) for r in rows)
-                    failure_details.append(f"  • Column '{col}' has empty cells at row(s): {rows_str}")
-
-            # Allowed values violations
-            allowed_violations = details.get("allowed_violations", {})
-            if allowed_violations:
-                for col, vals in allowed_violations.items():
-                    vals_str = ', '.join(f"'{v}'" for v in vals)
-                    failure_details.append(f"  • Column '{col}' contains invalid values: {vals_str}")
-
-            # Numeric violations
-            numeric_violations = details.get("numeric_violations", {})
-            if numeric_violations:
-                for col, rows in numeric_violations.items():
-                    rows_str = ', '.join(str(r) for r in rows)
-                    failure_details.append(f"  • Column '{col}' has non‑numeric entries at row(s): {rows_str}")
-
-            # Work code/name issues
-            work_violations = details.get("work_pair_violations", {})
-            if work_violations:
-                if 'missing_columns' in work_violations:
-                    cols = ', '.join(work_violations['missing_columns'])
-                    failure_details.append(f"  • Missing required columns: {cols}")
-                else:
-                    missing_code = work_violations.get('missing_code', [])
-                    missing_name = work_violations.get('missing_name', [])
-                    invalid_pairs = work_violations.get('invalid_pairs', {})
-                    if missing_code:
-                        rows_str = ', '.join(str(r) for r in missing_code)
-                        failure_details.append(f"  • Missing work code at row(s): {rows_str}")
-                    if missing_name:
-                        rows_str = ', '.join(str(r) for r in missing_name)
-                        failure_details.append(f"  • Missing work name at row(s): {rows_str}")
-                    for pair_key, rows in invalid_pairs.items():
-                        code, name = pair_key.split('|', 1)
-                        rows_str = ', '.join(str(r) for r in rows)
-                        failure_details.append(f"  • Invalid pair (code: '{code}', work: '{name}') at row(s): {rows_str}")
-
-            if failure_details:
-                self.output_box.insert(tk.END, "\n" + "\n".join(failure_details) + "\n", "red")
-
-            self.output_box.insert(tk.END, "\n")
+        bills_start = len(segments)
+        for row in bill_rows[:self._BILL_CHUNK]:
+            self._render_bill(write, row, percent_used, work_pairs_lines)
+        bills_end = len(segments)
 
         # Final summary
-        self.output_box.insert(tk.END, "="*60 + "\n")
-        self.output_box.insert(tk.END, "📊 FINAL SUMMARY\n")
-        self.output_box.insert(tk.END, "="*60 + "\n")
-        self.output_box.insert(tk.END, f"Total bills processed: {total_bills}\n")
-        if passed_bills:
-            self.output_box.insert(tk.END,
-                f"✅ PASSED: {len(passed_bills)} bill{'s' if len(passed_bills)!=1 else ''} "
-                f"- {', '.join(str(b) for b in passed_bills)}\n")
-        else:
-            self.output_box.insert(tk.END, "✅ PASSED: 0 bills\n")
-        if failed_bills:
-            self.output_box.insert(tk.END,
-                f"❌ FAILED: {len(failed_bills)} bill{'s' if len(failed_bills)!=1 else ''} "
-                f"- {', '.join(str(b) for b in failed_bills)}\n")
-        else:
-            self.output_box.insert(tk.END, "❌ FAILED: 0 bills\n")
-
-        self.output_box.insert(tk.END, f"\n{len(passed_bills)} out of {total_bills} bills passed.\n")
+        write(_final_summary(total_bills, passed_bills, failed_bills))
+        self._write_segments(segments[:bills_end], segments[bills_end:])
+        # Save Report redoes the summary with every bill listed
+        self._report = (segments[:bills_start], bill_rows, percent_used,
+                        work_pairs_lines, (total_bills, passed_bills, failed_bills))
+        if len(bill_rows) > self._BILL_CHUNK:
+            self._pending_bills = (bill_rows, self._BILL_CHUNK, percent_used, work_pairs_lines)
+            self._schedule_more_bills(self.root.after, 0)
         self.progress_label.config(text="")
 
+    def _render_bill(self, write, row, percent_used, work_pairs_lines):
+        """Write one bill's block (status, check lines, coordination, failure details)."""
+        bill_str, result, all_checks_pass = row
+        # Unpack the per-bill dicts once and bind the lookups used repeatedly below
+        checks, details = result["checks"], result["details"]
+        checks_get = checks.get
+        coord_info = details.get("coordination", {})
+        has_coordination = coord_info.get('has_coordination', False)
+
+        status = "✅ PASS" if all_checks_pass else "❌ FAIL"
+        write(f"{status}  Bill {bill_str}\n")
+        write(_BILL_SEP)
+
+        # ---- List all checks with appropriate symbols and text ----
+        write(_CHECK_LINES['columns_present'][bool(checks_get('columns_present'))])
+        write(_CHECK_LINES['no_missing_values'][bool(checks_get('no_missing_values'))])
+        write(_CHECK_LINES['allowed_values'][bool(checks_get('allowed_values'))])
+        write(_CHECK_LINES['numeric_values'][bool(checks_get('numeric_values'))])
+
+        # Work pairs valid (or, with no reference file, missing values only,
+        # which is included in the work_pairs_valid check)
+        write(work_pairs_lines[bool(checks_get('work_pairs_valid'))])
+
+        # Coordination charge – correct/incorrect with the calculation, or a
+        # warning (and pass) when the bill has no coordination row
+        coord_block = _COORD_BLOCKS[
+            has_coordination, bool(checks_get('coordination_correct', False))]
+        coord_values = {
+            'base': coord_info.get('base_amount', 0),
+            'expected': coord_info.get('expected', 0),
+            'actual': coord_info.get('actual_coord', 0),
+            'diff': coord_info.get('diff', 0),
+            'percent': percent_used,
+        } if has_coordination else None
+        for template, tag in coord_block:
+            write(template.format_map(coord_values) if coord_values else template, tag)
+        if has_coordination and coord_info.get("excluded_items"):
+            write("     Excluded from base amount:\n" + "".join([
+                f"        - {item['Item']} (Code: {item['Work code']}): ₹{item['Cost']:.2f}\n"
+                for item in coord_info["excluded_items"]
+            ]))
+
+        # ---- Detailed failure explanations (non‑coordination) ----
+        # Only the sections a bill actually fails are formatted
+        failure_details = []
+        for key, detail_lines in _DETAIL_FORMATTERS:
+            section = details.get(key)
+            if section:
+                failure_details.extend(detail_lines(section))
+
+        if failure_details:
+            write("\n" + "\n".join(failure_details) + "\n", "red")
+
+        write("\n")
+
+    @staticmethod
+    def _stat_file(path):
+        """One os.stat per input file: the stat result, or None if it does not exist."""
+        try:
+            return os.stat(path)
+        except (OSError, ValueError):   # as os.path.exists
+            return None
+
     def run_check(self):
+        from validator import BillValidator
+
+        # Snapshot the entry values once; the worker only ever sees these plain strings
         bill_path = self.bill_file_path.get().strip()
         exclude_path = self.exclude_file_path.get().strip()
         allowed_path = self.allowed_file_path.get().strip()
@@ -417,127 +714,89 @@ class BillValidationGUI:
         if not bill_path:
             messagebox.showerror("Error", "Please select a Bill CSV file.")
             return
-        if not os.path.exists(bill_path):
+        bill_stat = self._stat_file(bill_path)
+        if bill_stat is None:
             messagebox.showerror("Error", f"Bill file not found:\n{bill_path}")
             return
 
-        if exclude_path and not os.path.exists(exclude_path):
+        if exclude_path and self._stat_file(exclude_path) is None:
             if not messagebox.askyesno("File Not Found",
                 f"Exclude patterns file not found:\n{exclude_path}\n\nContinue without exclusion patterns?"):
                 return
+            else:
+                exclude_path = None
 
         if not allowed_path:
             messagebox.showerror("Error", "Please select an Allowed Values CSV file (mandatory).")
             return
-        if not os.path.exists(allowed_path):
+        if self._stat_file(allowed_path) is None:
             messagebox.showerror("Error", f"Allowed values file not found:\n{allowed_path}")
             return
 
-        if workcode_path and not os.path.exists(workcode_path):
+        if workcode_path and self._stat_file(workcode_path) is None:
             if not messagebox.askyesno("File Not Found",
                 f"Work code reference file not found:\n{workcode_path}\n\nContinue without work code validation?"):
                 return
             else:
                 workcode_path = None
 
-        try:
-            validator = BillValidator(
-                file_path=bill_path,
-                exclude_path=exclude_path,
-                allowed_values_path=allowed_path,
-                coordination_percentage=percent,
-                work_code_path=workcode_path if workcode_path else None
-            )
-            result = validator.load_and_validate(progress_callback=self.update_progress)
-            self.format_output(result, percent)
-        except Exception as e:
-            messagebox.showerror("Error", f"Validation failed:\n{e}")
-
-    def refresh_output(self):
-        self.output_box.delete(1.0, tk.END)
-        instructions = """\
-📋 **WELCOME TO THE BILL VALIDATION TOOL**
-
-This tool checks your bill CSV file against a set of validation rules.  
-Follow the steps below to prepare your data and run the check.
-
----
-
-## STEP 1: UNDERSTAND THE TEMPLATE FILES
-
-Four CSV files are used (default names are shown in the entry fields above).  
-**You must keep the column headings exactly as they appear in these templates.**  
-You can modify the data rows (copy/paste your own data) but **do not change the header row**.
-
-| File              | Purpose                                                                                   | Required Columns (examples)                          |
-|-------------------|-------------------------------------------------------------------------------------------|------------------------------------------------------|
-| `Bill.csv`        | The actual bill data you want to validate.                                                | Contract Bill No, Item, Work code, Work, Cost, ...   |
-| `Exclude.csv`     | **Exclusion conditions** – each row defines a set of column‑value pairs.                  | Any columns present in the bill; rows with **all** matching values are excluded from the coordination base amount. |
-| `Valuecheck.csv`  | Defines which values are allowed in each column (mandatory).                              | One column per required field (e.g. Contract Bill No)|
-| `Workcode.csv`    | Reference list of valid (Work code, Work) pairs (optional, but recommended).             | Work code, Work, Start, End                           |
-
----
-
-## STEP 2: PREPARE YOUR DATA
-
-1. **Open each template file** in a spreadsheet editor (Excel, LibreOffice, etc.) or a text editor.
-2. **Keep the first row (headers) untouched**.
-3. **Paste your data starting from row 2**.  
-   - For `Bill.csv`, paste your bill rows.
-   - For `Exclude.csv`, list **exclusion conditions**.  
-     * Each row defines one condition. A bill row is excluded **only if it matches all the columns you fill in that row**.  
-     * For example, a row with `Work code = S` excludes all rows with Work code 'S'.  
-     * A row with `Work = Site` and `Item = Cement` excludes only rows where both Work is 'Site' **and** Item is 'Cement'.  
-     * Empty cells are ignored (they do not form part of the condition).
-   - For `Valuecheck.csv`, list **all allowed values** for each column.  
-     * Use `any` if any non‑empty value is allowed.  
-     * Use `blank` if empty cells are allowed.  
-     * Otherwise, list every permissible value (one per row).
-   - For `Workcode.csv`, list all valid work‑code / work‑name pairs (optional).
-4. **Save the files** as CSV (comma‑separated values). Keep them in the same folder as this program, or use the Browse buttons to select them.
-
----
-
-## STEP 3: SET THE COORDINATION PERCENTAGE
-
-Enter the percentage used for coordination charge (e.g., 15 for 15%).  
-The tool will check that the coordination charge row equals exactly this percentage of the base amount (after applying exclusions).
-
----
-
-## STEP 4: RUN THE VALIDATION
-
-Click the **Run Check** button. The tool will:
-
-- Verify that all required columns exist.
-- Check for empty cells (unless `blank` is allowed).
-- Validate that values belong to the allowed lists.
-- Ensure numeric columns contain only numbers.
-- If a work‑code reference file is provided, verify every (Work code, Work) pair.
-- Calculate the expected coordination charge and compare it with the actual value.
-
----
-
-## STEP 5: INTERPRET THE RESULTS
+        validator = BillValidator(
+            file_path=bill_path,
+            exclude_path=exclude_path if exclude_path else None,
+            allowed_values_path=allowed_path,
+            coordination_percentage=percent,
+            work_code_path=workcode_path if workcode_path else None,
+            csv_cache=self._csv_cache
+        )
+        # Validate on a worker thread; Tk widgets are only touched from _poll_progress.
+        # Run Check stays disabled until the worker reports back.
+        self.run_button.config(state="disabled")
+        self.progress_label.config(
+            text=f"Reading {os.path.basename(bill_path)} ({bill_stat.st_size / 1_048_576:.1f} MB)...")
+        threading.Thread(target=self._worker, args=(validator,), daemon=True).start()
+        self.root.after(50, self._poll_progress, percent)
+
+    def save_report(self):
+        """Write the full last report, every bill included, to a text file."""
+        if self._report is None:
+            messagebox.showinfo("Save Report", "Run a check first to produce a report.")
+            return
+        filename = filedialog.asksaveasfilename(
+            title="Save Report",
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
 
-- **Green checkmarks (✅)** indicate passed checks.
-- **Red crosses (❌)** indicate failures.
-- **Orange warning (⚠️)** indicates that a check was skipped (e.g., no coordination charge).
-- Detailed failure explanations are shown in **red text** below each bill.
-- A final summary shows how many bills passed/failed.
+        head, bill_rows, percent_used, work_pairs_lines, summary = self._report
+        parts = [text for text, _ in head]
 
-If you need to run another check, click **Refresh** to clear the output and return to these instructions.
+        def write(text, tag=None):
+            parts.append(text)
 
----
+        # Bills not yet rendered in the output box are rendered here
+        for row in bill_rows:
+            self._render_bill(write, row, percent_used, work_pairs_lines)
+        if summary is not None:
+            # Uncapped here, so the file names every passed and failed bill
+            parts.append(_final_summary(*summary, limit=None))
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write("".join(parts))
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save report:\n{e}")
 
-**Need help?** Make sure your CSV files use the correct column headers and that the data is properly formatted.  
-If you see unexpected errors, check the console for more details.
-"""
-        self.output_box.insert(tk.END, instructions)
+    def refresh_output(self):
         self.progress_label.config(text="")
+        if self._showing_instructions:
+            return
+        self._write_segments([(self._INSTRUCTIONS, None)])
+        self._showing_instructions = True
 
 
 def main():
+    logging.basicConfig(level=logging.WARNING)
     root = tk.Tk()
     app = BillValidationGUI(root)
     root.mainloop()
@@ -1,12 +1,12 @@
 import pandas as pd
 
-# Read the CSV file
-df = pd.read_csv("test.csv")
+# Read only the 'unit' column; as a category, each distinct unit is stored once
+df = pd.read_csv("test.csv", usecols=["unit"], dtype={"unit": "category"})
 
-# Get unique values from 'unit' column
+# Get unique values from 'unit' column (in order of first appearance)
 unique_units = df["unit"].drop_duplicates()
 
 # Save to new CSV
 unique_units.to_csv("unique_units.csv", index=False)
 
-print("Done. Unique values saved to unique_units.csv")
\ No newline at end of file
+print("Done. Unique values saved to unique_units.csv")
@@ -3,13 +3,27 @@ Bill Validation Module
 Handles loading of data, exclusion patterns, allowed values, and per-bill checks.
 """
 
+import logging
+import os
 import pandas as pd
 import numpy as np
 from collections import defaultdict
 
+log = logging.getLogger(__name__)
+
+# Special tokens in the allowed-values file ('any' value, 'blank' allowed)
+ALLOWED_TOKENS = frozenset(('any', 'blank'))
+
+# Columns that must hold numbers
+NUMERIC_COLUMNS = ('Cost', 'Rate per unit', 'Quantity')
+
+# Parsed frames kept in a shared csv_cache (oldest entries are dropped first)
+CSV_CACHE_SIZE = 8
+
 class BillValidator:
     def __init__(self, file_path, exclude_path=None, allowed_values_path=None,
-                 coordination_percentage=15.0, tolerance=10.0, work_code_path=None):
+                 coordination_percentage=15.0, tolerance=10.0, work_code_path=None,
+                 csv_cache=None):
         """
         Initialize the validator with file paths and settings.
 
@@ -19,6 +33,10 @@ class BillValidator:
         :param coordination_percentage: Percentage used for coordination charge calculation.
         :param tolerance: Allowed difference between expected and actual coordination charge.
         :param work_code_path: Path to CSV with valid work codes and work names (optional).
+        :param csv_cache: Optional collections.OrderedDict shared between runs. Parsed CSVs
+                          are kept in it by path, and reused while the file's modification
+                          time and size are unchanged; an edited file's frame is replaced.
+                          Cached frames must not be modified.
         """
         self.file_path = file_path
         self.exclude_path = exclude_path
@@ -26,11 +44,13 @@ class BillValidator:
         self.coordination_percentage = coordination_percentage
         self.tolerance = tolerance
         self.work_code_path = work_code_path
+        self.csv_cache = csv_cache
 
         # Will be populated after loading
         self.df = None
         self.exclude_conditions = []          # list of dicts {column: value, ...}
-        self.allowed_dict = {}                 # column -> set of allowed values
+        self.allowed_dict = {}                 # column -> frozenset of allowed values
+        self.allowed_display = {}              # column -> sorted tuple of values, tokens left out
         self.required_columns = []              # will be set from allowed_dict keys
         self.valid_work_pairs = set()           # set of (code, name) tuples from reference file
         self.work_code_issues = None            # will hold dict of missing/duplicate info
@@ -44,7 +64,7 @@ class BillValidator:
             return
 
         try:
-            excl_df = pd.read_csv(self.exclude_path, dtype=str)  # read all as strings
+            excl_df = self._read_csv(self.exclude_path, dtype=str)  # read all as strings
             # Drop completely empty rows (all NaN)
             excl_df = excl_df.dropna(how='all')
             conditions = []
@@ -59,7 +79,7 @@ class BillValidator:
                     conditions.append(condition)
             self.exclude_conditions = conditions
         except Exception as e:
-            print(f"Warning: Could not load exclude patterns: {e}")
+            log.warning("Could not load exclude patterns: %s", e)
             self.exclude_conditions = []
 
     def load_allowed_values(self):
@@ -78,21 +98,24 @@ class BillValidator:
 
         try:
             # Read all columns as strings to preserve original representation (e.g., '6' not '6.0')
-            allowed_df = pd.read_csv(self.allowed_values_path, dtype=str)
+            allowed_df = self._read_csv(self.allowed_values_path, dtype=str)
 
             # The columns of this DataFrame are the required columns.
             self.required_columns = list(allowed_df.columns)
 
             # Build allowed_dict: for each column, collect all non‑empty, non‑blank values.
             self.allowed_dict = {}
+            self.allowed_display = {}
             for col in self.required_columns:
                 # Get all values from this column, drop NaN/empty, convert to string, strip.
                 values = allowed_df[col].dropna().astype(str).str.strip()
                 # Keep only non‑empty strings.
                 values = values[values != '']
                 # Create a set of unique values.
-                unique_vals = set(values)
+                unique_vals = frozenset(values)
                 self.allowed_dict[col] = unique_vals
+                # Sorted once here for display, without the special tokens
+                self.allowed_display[col] = tuple(sorted(unique_vals - ALLOWED_TOKENS))
 
         except Exception as e:
             raise ValueError(f"Error loading allowed values: {e}")
@@ -110,7 +133,7 @@ class BillValidator:
         }
 
         try:
-            wc_df = pd.read_csv(self.work_code_path, dtype=str)
+            wc_df = self._read_csv(self.work_code_path, dtype=str)
             # Find columns named 'Work code' and 'Work' (case‑insensitive)
             code_col = None
             name_col = None
@@ -182,36 +205,110 @@ class BillValidator:
 
 
 
+    def _cached(self, path, options, read):
+        """Return read() for the file at path, through csv_cache when one is set.
+        Entries are keyed by the path and options (how the file is parsed) and
+        hold the file's modification time and size; an entry whose file has
+        changed is replaced, so each file keeps one frame per options."""
+        if self.csv_cache is None:
+            return read()
+        st = os.stat(path)
+        key = (os.path.abspath(path), options)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self.csv_cache.get(key)
+        if entry is not None and entry[0] == stamp:
+            self.csv_cache.move_to_end(key)
+            return entry[1]
+        # Drop the stale frame before parsing, so the two are not held together
+        self.csv_cache.pop(key, None)
+        df = read()
+        self.csv_cache[key] = (stamp, df)
+        if len(self.csv_cache) > CSV_CACHE_SIZE:
+            self.csv_cache.popitem(last=False)
+        return df
+
+    def _read_csv(self, path, **kwargs):
+        """pd.read_csv, cached on the file and the keyword arguments."""
+        return self._cached(path, tuple(sorted(kwargs.items())),
+                            lambda: pd.read_csv(path, **kwargs))
+
+    def _read_bill_csv(self):
+        """Read the bill CSV (through csv_cache). Only the columns the checks read
+        are parsed, so the full-width frame is never built."""
+        used = set(self.required_columns)
+        used.update(['Contract Bill No', 'Work code', 'Work', 'Item',
+                     'Cost', 'Rate per unit', 'Quantity'])
+        for condition in self.exclude_conditions:
+            used.update(condition.keys())
+        return self._cached(self.file_path, ('bill', frozenset(used)),
+                            lambda: self._parse_bill_csv(used))
+
+    def _parse_bill_csv(self, used):
+        """Parse the bill CSV, keeping only the columns in used."""
+        return pd.read_csv(self.file_path, usecols=lambda col: col in used)
+
     def _check_columns_present(self, df_columns):
         """Check that all required columns (from allowed_dict) are present."""
         missing = [col for col in self.required_columns if col not in df_columns]
         return len(missing) == 0, missing
 
-    def _check_numeric_values(self, bill_df):
+    @staticmethod
+    def _non_numeric_cells(df):
+        """Frame of which non‑empty cells of the numeric columns present in df do
+        not parse as numbers. Each distinct cell value is parsed once."""
+        def not_number(x):
+            # Empty cells are either allowed by 'blank' or caught by the missing check
+            if str(x).strip() == '':
+                return False
+            try:
+                float(x)
+            except (ValueError, TypeError):
+                return True
+            return False
+
+        cells = {}
+        for col in NUMERIC_COLUMNS:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])   # empty cells get code -1
+            bad = np.fromiter((not_number(x) for x in uniques), dtype=bool,
+                              count=len(uniques))
+            cells[col] = np.append(bad, False)[codes]
+        return pd.DataFrame(cells, index=df.index)
+
+    def _check_numeric_values(self, bill_df, non_numeric=None):
         """
         Check that numeric columns contain only numbers.
         Empty cells are skipped (they are handled by missing‑values check).
+        non_numeric, if given, is the bill's slice of the frame
+        load_and_validate precomputes for the whole file.
         """
-        numeric_cols = ['Cost', 'Rate per unit', 'Quantity']
-        violations = defaultdict(list)
-        for col in numeric_cols:
-            if col not in bill_df.columns:
-                continue
-            for idx, val in bill_df[col].items():
-                # Skip empty cells (they are either allowed by 'blank' or will be caught by missing check)
-                if pd.isna(val) or str(val).strip() == '':
-                    continue
-                try:
-                    float(val)
-                except (ValueError, TypeError):
-                    violations[col].append(idx + 2)  # +2 because 0-index + header row
-        return len(violations) == 0, dict(violations)
+        if non_numeric is None:
+            non_numeric = self._non_numeric_cells(bill_df)
+        violations = {}
+        for col in non_numeric.columns:
+            col_bad = non_numeric[col].to_numpy()
+            if col_bad.any():
+                violations[col] = (bill_df.index[col_bad] + 2).tolist()  # +2 because 0-index + header row
+        return len(violations) == 0, violations
 
-    def _check_no_missing_values(self, bill_df):
+    def _normalised_text(self, df):
+        """Stripped text of the required columns present in df, and a frame of
+        which of those cells are empty (missing, or blank after stripping)."""
+        cols = [col for col in self.required_columns if col in df.columns]
+        text = pd.DataFrame({col: df[col].astype(str).str.strip() for col in cols},
+                            index=df.index)
+        return text, df[cols].isna() | (text == '')
+
+    def _check_no_missing_values(self, bill_df, empty=None):
         """
         Check for empty cells in required columns.
         If a column's allowed set contains the special token 'blank', missing values are allowed.
+        empty, if given, is the bill's slice of the empty-cell frame
+        load_and_validate precomputes for the whole file.
         """
+        if empty is None:
+            _, empty = self._normalised_text(bill_df)
         missing = defaultdict(list)
         for col in self.required_columns:
             if col not in bill_df.columns:
@@ -220,51 +317,124 @@ class BillValidator:
             allowed_set = self.allowed_dict.get(col, set())
             if 'blank' in allowed_set:
                 continue
-            # Find rows where value is NaN or empty string after stripping
-            empty_mask = bill_df[col].isna() | (bill_df[col].astype(str).str.strip() == '')
-            empty_indices = bill_df.index[empty_mask].tolist()
+            # Rows where value is NaN or empty string after stripping
+            empty_indices = bill_df.index[empty[col].to_numpy()].tolist()
             if empty_indices:
                 # Convert to 1‑based row numbers (header row is 1, data rows start at 2)
                 missing[col] = [idx + 2 for idx in empty_indices]
         return len(missing) == 0, dict(missing)
 
-    def _check_allowed_values(self, bill_df):
+    def _invalid_cells(self, text, empty):
         """
-        Check that values in columns with allowed sets are within those sets.
+        Frame of which non‑empty cells fall outside their column's allowed set,
+        for the columns of text that have a restricted set.
         - If the allowed set contains 'any', any non‑empty value is permitted.
+        - If the allowed set is empty, there are no restrictions (though this shouldn't happen with valid files).
+        """
+        return pd.DataFrame({
+            col: (~empty[col] & ~text[col].isin(allowed_set)).to_numpy()
+            for col, allowed_set in self.allowed_dict.items()
+            if col in text.columns and allowed_set and 'any' not in allowed_set
+        }, index=text.index)
+
+    def _check_allowed_values(self, bill_df, text=None, invalid=None):
+        """
+        Check that values in columns with allowed sets are within those sets.
         - Empty cells are skipped (they are handled by missing‑values check).
         - If the allowed set contains 'blank', that only affects missing‑values; here it is treated as a normal value.
+        text and invalid, if given, are the bill's slices of the stripped-text and
+        invalid-cell frames load_and_validate precomputes for the whole file.
         """
-        violations = defaultdict(list)
-        for col, allowed_set in self.allowed_dict.items():
-            if col not in bill_df.columns:
-                continue
-            # If the allowed set contains 'any', treat as no restrictions for non‑empty values
-            if 'any' in allowed_set:
-                continue
-            # If allowed set is empty, treat as no restrictions (though this shouldn't happen with valid files)
-            if not allowed_set:
+        if text is None:
+            text, empty = self._normalised_text(bill_df)
+            invalid = self._invalid_cells(text, empty)
+        violations = {}
+        for col in invalid.columns:
+            col_invalid = invalid[col].to_numpy()
+            if col_invalid.any():
+                # Each invalid value listed once
+                violations[col] = sorted(set(text[col][col_invalid]))
+        return len(violations) == 0, violations
+
+    @staticmethod
+    def _condition_matches(series, val):
+        """Boolean array: which cells of series match the exclusion value val.
+        A cell matches if both parse as numbers equal within 1e-9, otherwise if its
+        stripped text equals val; empty cells never match. Each distinct cell value
+        is tested once and the answers are spread back over the rows."""
+        # The exclusion value is parsed once, not once per cell value
+        try:
+            number = float(val)
+        except ValueError:
+            # Not a number, so every cell is compared as text
+            return BillValidator._text_matches(series, (val,))
+
+        def match_func(x):
+            # Try numeric comparison within tolerance
+            try:
+                return abs(float(x) - number) < 1e-9
+            except ValueError:
+                # Fall back to string comparison
+                return str(x).strip() == val
+
+        codes, uniques = pd.factorize(series)   # empty cells get code -1
+        matched = np.fromiter((match_func(x) for x in uniques), dtype=bool,
+                              count=len(uniques))
+        return np.append(matched, False)[codes]
+
+    @staticmethod
+    def _text_matches(series, values):
+        """Boolean array: which cells of series have stripped text in values.
+        Empty cells never match; each distinct cell value is compared once."""
+        codes, uniques = pd.factorize(series)   # empty cells get code -1
+        matched = np.asarray(pd.Index(uniques).astype(str).str.strip().isin(values), dtype=bool)
+        return np.append(matched, False)[codes]
+
+    def _exclusion_mask(self, df):
+        """Rows of df matching any exclusion condition (all of its column/value pairs)."""
+        exclude_mask = np.zeros(len(df), dtype=bool)
+        # Single-column text conditions are collected per column and matched
+        # in one pass over that column
+        text_values = defaultdict(set)
+        for condition in self.exclude_conditions:
+            # Only consider this condition if all its columns exist in the bill
+            if not all(col in df.columns for col in condition.keys()):
                 continue
-            for idx, val in bill_df[col].items():
-                # Skip empty cells (they are either allowed by 'blank' in missing check)
-                if pd.isna(val) or str(val).strip() == '':
+
+            if len(condition) == 1:
+                col, val = next(iter(condition.items()))
+                try:
+                    float(val)
+                except ValueError:
+                    text_values[col].add(val)
                     continue
-                str_val = str(val).strip()
-                if str_val not in allowed_set:
-                    violations[col].append(str_val)
-        # Remove duplicates in the list of invalid values per column
-        violations = {col: sorted(set(vals)) for col, vals in violations.items()}
-        return len(violations) == 0, violations
 
-    def _check_coordination(self, bill_df):
+            # Start with all rows True, then AND each column condition using robust comparison
+            cond_mask = np.ones(len(df), dtype=bool)
+            for col, val in condition.items():
+                cond_mask &= self._condition_matches(df[col], val)
+            exclude_mask |= cond_mask
+        for col, values in text_values.items():
+            exclude_mask |= self._text_matches(df[col], values)
+        return pd.Series(exclude_mask, index=df.index)
+
+    @staticmethod
+    def _coordination_mask(df):
+        """Rows whose Work code is exactly 'C' (after stripping)."""
+        return df['Work code'].astype(str).str.strip() == 'C'
+
+    def _check_coordination(self, bill_df, exclude_mask=None, coord_mask=None):
         """
         Check coordination charge correctness.
         Coordination rows are those where Work code is exactly 'C'.
         Exclusions are based on conditions loaded from exclude CSV.
+        exclude_mask and coord_mask, if given, are the bill's slices of the masks
+        load_and_validate precomputes for the whole file.
         Returns (passed, details_dict).
         """
         # Identify coordination charge row(s) – exact match on Work code == 'C'
-        coord_mask = bill_df['Work code'].astype(str).str.strip() == 'C'
+        if coord_mask is None:
+            coord_mask = self._coordination_mask(bill_df)
         coord_rows = bill_df[coord_mask]
 
         details = {
@@ -284,29 +454,8 @@ class BillValidator:
         details['actual_coord'] = actual_coord
 
         # Build exclusion mask based on all conditions
-        exclude_mask = pd.Series([False] * len(bill_df), index=bill_df.index)
-
-        for condition in self.exclude_conditions:
-            # Only consider this condition if all its columns exist in the bill
-            if not all(col in bill_df.columns for col in condition.keys()):
-                continue
-
-            # Start with all rows True, then AND each column condition using robust comparison
-            cond_mask = pd.Series([True] * len(bill_df), index=bill_df.index)
-            for col, val in condition.items():
-                # Define a matching function that tries numeric comparison first
-                def match_func(x):
-                    if pd.isna(x):
-                        return False
-                    # Try numeric comparison
-                    try:
-                        # Convert both to float and compare within tolerance
-                        return abs(float(x) - float(val)) < 1e-9
-                    except ValueError:
-                        # Fall back to string comparison
-                        return str(x).strip() == val
-                cond_mask &= bill_df[col].apply(match_func)
-            exclude_mask |= cond_mask
+        if exclude_mask is None:
+            exclude_mask = self._exclusion_mask(bill_df)
 
         # Remove coordination rows themselves from base
         base_mask = ~exclude_mask & ~coord_mask
@@ -314,14 +463,9 @@ class BillValidator:
         base_sum = base_df['Cost'].sum()
         details['base_amount'] = base_sum
 
-        # Record excluded items (for reporting)
-        excluded = bill_df[exclude_mask & ~coord_mask]
-        for _, row in excluded.iterrows():
-            details['excluded_items'].append({
-                'Item': row['Item'],
-                'Work code': row['Work code'],
-                'Cost': row['Cost']
-            })
+        # Record excluded items (for reporting), straight from the masked slice
+        details['excluded_items'] = bill_df.loc[
+            exclude_mask & ~coord_mask, ['Item', 'Work code', 'Cost']].to_dict('records')
 
         expected = base_sum * (self.coordination_percentage / 100.0)
         details['expected'] = expected
@@ -402,7 +546,7 @@ class BillValidator:
 
         # 3. Load main bill CSV
         try:
-            self.df = pd.read_csv(self.file_path)
+            self.df = self._read_bill_csv()
         except Exception as e:
             raise ValueError(f"Could not read bill file: {e}")
 
@@ -414,42 +558,70 @@ class BillValidator:
                 'missing_columns': missing_cols,
                 'exclude_conditions': self.exclude_conditions,
                 'allowed_dict': self.allowed_dict,
+                'allowed_display': self.allowed_display,
                 'work_pairs_checked': bool(self.valid_work_pairs),
                 'work_code_issues': self.work_code_issues,
                 'total_bills': 0,
                 'results': {}
             }
 
-        # 5. Group by Contract Bill No
-        bill_numbers = self.df['Contract Bill No'].dropna().unique()
-        total_bills = len(bill_numbers)
+        # 5. Normalise the whole file once: Cost as numbers (non-numeric -> NaN),
+        #    and the exclusion and coordination masks. The loaded frame may be
+        #    shared through csv_cache, so the converted column goes on a new frame.
+        df = self.df.assign(Cost=pd.to_numeric(self.df['Cost'], errors='coerce'))
+
+        # Match the exclusion conditions once over the whole file; each bill takes its slice
+        condition_cols = [col for col in dict.fromkeys(
+            col for condition in self.exclude_conditions for col in condition)
+            if col in df.columns]
+        file_exclude_mask = self._exclusion_mask(df[condition_cols])
+        file_coord_mask = self._coordination_mask(df)
+        # Stripped text and empty cells of the required columns, shared by the
+        # missing-value and allowed-value checks, and the cells outside their
+        # allowed sets (each column matched against its set once)
+        file_text, file_empty = self._normalised_text(df)
+        file_invalid = self._invalid_cells(file_text, file_empty)
+        # Cells of the numeric columns that do not parse (Cost is already numeric)
+        file_non_numeric = self._non_numeric_cells(df)
+
+        # 6. Group by Contract Bill No (one grouping pass instead of a mask per bill;
+        #    sort=False keeps bills in order of first appearance)
+        bill_groups = df.groupby('Contract Bill No', sort=False)
+        total_bills = bill_groups.ngroups
+        # Each bill's row positions, for slicing the file-wide frames above by
+        # position rather than by index label
+        bill_positions = bill_groups.indices
         results = {}
 
-        for idx, bill in enumerate(bill_numbers, start=1):
+        for idx, (bill, bill_df) in enumerate(bill_groups, start=1):
             if progress_callback:
                 progress_callback(idx, total_bills, bill)
 
-            bill_df = self.df[self.df['Contract Bill No'] == bill].copy()
-            bill_df['Cost'] = pd.to_numeric(bill_df['Cost'], errors='coerce')
-
             checks = {}
             details = {}
 
             checks['columns_present'] = True
 
-            nmv_ok, nmv_details = self._check_no_missing_values(bill_df)
+            rows = bill_positions[bill]
+            bill_text = file_text.iloc[rows]
+            bill_empty = file_empty.iloc[rows]
+            bill_invalid = file_invalid.iloc[rows]
+            bill_non_numeric = file_non_numeric.iloc[rows]
+
+            nmv_ok, nmv_details = self._check_no_missing_values(bill_df, bill_empty)
             checks['no_missing_values'] = nmv_ok
             details['missing_values'] = nmv_details
 
-            coord_ok, coord_details = self._check_coordination(bill_df)
+            coord_ok, coord_details = self._check_coordination(
+                bill_df, file_exclude_mask.iloc[rows], file_coord_mask.iloc[rows])
             checks['coordination_correct'] = coord_ok
             details['coordination'] = coord_details
 
-            av_ok, av_details = self._check_allowed_values(bill_df)
+            av_ok, av_details = self._check_allowed_values(bill_df, bill_text, bill_invalid)
             checks['allowed_values'] = av_ok
             details['allowed_violations'] = av_details
 
-            num_ok, num_details = self._check_numeric_values(bill_df)
+            num_ok, num_details = self._check_numeric_values(bill_df, bill_non_numeric)
             checks['numeric_values'] = num_ok
             details['numeric_violations'] = num_details
 
@@ -468,6 +640,7 @@ class BillValidator:
             'missing_columns': [],
             'exclude_conditions': self.exclude_conditions,
             'allowed_dict': self.allowed_dict,
+            'allowed_display': self.allowed_display,
             'work_pairs_checked': bool(self.valid_work_pairs),
             'work_code_issues': self.work_code_issues,
             'total_bills': total_bills,